@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""
+
+    Benchmarks for the Paymill library against a local stub of Paymill API V2.
+
+    python benchmark.py --requests 500 --latency 0.005 --output results.json
+    python benchmark.py --compare results.json
+
+"""
+
+import BaseHTTPServer
+import SocketServer
+import argparse
+import base64
+import gc
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import threading
+import time
+import timeit
+import urllib
+import urllib2
+import urlparse
+
+import paymill
+
+
+ENTITY_PREFIXES = {
+    "payments": "pay",
+    "preauthorizations": "preauth",
+    "transactions": "tran",
+    "clients": "client",
+    "refunds": "refund",
+    "offers": "offer",
+    "subscriptions": "sub",
+}
+
+
+def entity(endpoint, id, padding=0):
+    """
+    fake endpoint entity shaped like the ones returned by Paymill API V2
+
+    padding: integer, extra bytes in description, controls payload size
+
+    returns python dict object
+    """
+    created_at = 1349946151 + abs(hash(id)) % 10000000
+    base = {"id": id, "created_at": created_at, "updated_at": created_at, "app_id": None}
+    payment = {
+        "id": "pay_917018675b21ca03c4fb", "type": "creditcard", "client": "client_88a388d9dd48f86c3136",
+        "card_type": "visa", "country": None, "expire_month": 12, "expire_year": 2015, "card_holder": None,
+        "last4": "1111", "created_at": 1349942085, "updated_at": 1349942085, "app_id": None,
+    }
+    client = {
+        "id": "client_88a388d9dd48f86c3136", "email": "lovely-client@example.com", "description": None,
+        "created_at": 1340199740, "updated_at": 1340199760, "payment": [], "subscription": None, "app_id": None,
+    }
+    offer = {
+        "id": "offer_40237e20a7d5a231d99b", "name": "Nerd Special", "amount": 4980, "currency": "EUR",
+        "interval": "1 WEEK", "trial_period_days": 0, "created_at": 1341935129, "updated_at": 1341935129,
+        "subscription_count": {"active": 3, "inactive": 0}, "app_id": None,
+    }
+    description = "x" * padding
+    if endpoint == "payments":
+        base.update(payment, id=id)
+    elif endpoint == "clients":
+        base.update(client, id=id, created_at=created_at, updated_at=created_at, description=description)
+    elif endpoint == "offers":
+        base.update(offer, id=id, created_at=created_at, updated_at=created_at)
+    elif endpoint == "transactions":
+        base.update({
+            "amount": "4200", "origin_amount": 4200, "status": "closed", "description": description,
+            "livemode": False, "refunds": None, "currency": "EUR", "response_code": 20000,
+            "short_id": "7357.7357.7357", "is_fraud": False, "invoices": [], "payment": payment, "client": client,
+            "preauthorization": None, "fees": [],
+        })
+    elif endpoint == "refunds":
+        base.update({
+            "transaction": "tran_023d3b5769321c649435", "amount": "4200", "status": "refunded",
+            "description": description, "livemode": False, "response_code": 20000,
+        })
+    elif endpoint == "preauthorizations":
+        base.update({
+            "amount": "4200", "currency": "EUR", "status": "closed", "livemode": False, "payment": payment,
+            "client": client,
+        })
+    elif endpoint == "subscriptions":
+        base.update({
+            "offer": offer, "livemode": False, "cancel_at_period_end": False, "trial_start": None,
+            "trial_end": None, "next_capture_at": created_at + 604800, "canceled_at": None, "payment": payment,
+            "client": client,
+        })
+    return base
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    answers Paymill API V2 requests with fake entities
+    """
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_request(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        length = int(self.headers.get("content-length") or 0)
+        data = dict(urlparse.parse_qsl(self.rfile.read(length))) if length else {}
+        parts = urlparse.urlsplit(self.path)
+        segments = [segment for segment in parts.path.split("/") if segment][1:]
+        endpoint = segments[0] if segments else ""
+        id = segments[1] if len(segments) > 1 else ""
+        padding = self.server.padding
+
+        if endpoint not in ENTITY_PREFIXES:
+            return self.respond(404, {"error": "Not found"})
+        if self.command == "GET" and not id:
+            query = dict(urlparse.parse_qsl(parts.query))
+            offset = int(query.get("offset", 0))
+            count = min(int(query.get("count", 20)), self.server.total - offset)
+            result = {
+                "data": [
+                    entity(endpoint, "%s_%020x" % (ENTITY_PREFIXES[endpoint], offset + index), padding)
+                    for index in range(max(count, 0))
+                ],
+                "data_count": self.server.total,
+                "mode": "test",
+            }
+            return self.respond(200, result)
+        if self.command == "POST" and endpoint != "refunds":
+            id = "%s_%020x" % (ENTITY_PREFIXES[endpoint], self.server.next_id())
+        result = entity(endpoint, id, padding)
+        result.update((key, val) for key, val in data.iteritems() if key in result)
+        if self.command == "DELETE":
+            result = []
+        return self.respond(200, {"data": result, "mode": "test"})
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def respond(self, status, result):
+        body = json.dumps(result)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    threaded local stub of Paymill API V2
+
+    latency: float, seconds every response is delayed
+    padding: integer, extra bytes per entity
+    total: integer, number of entities every list pretends to hold
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.0, padding=0, total=1000):
+        BaseHTTPServer.HTTPServer.__init__(self, address, StubHandler)
+        self.latency = latency
+        self.padding = padding
+        self.total = total
+        self._id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://%s:%s/v2/" % self.server_address
+
+    def next_id(self):
+        with self._lock:
+            self._id += 1
+            return self._id
+
+
+def serve(queue, latency, padding, total):
+    server = StubServer(latency=latency, padding=padding, total=total)
+    queue.put(server.url)
+    server.serve_forever()
+
+
+def start_server(latency=0.0, padding=0, total=1000):
+    """
+    runs stub server in a separate process, so its cpu time does not count against the client
+
+    returns tuple of (process, api url)
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(queue, latency, padding, total))
+    process.daemon = True
+    process.start()
+    return process, queue.get(timeout=10)
+
+
+SCENARIOS = [
+    ("payments.create", lambda p, i: p.payments.create("tok_%d" % i)),
+    ("payments.details", lambda p, i: p.payments.details("pay_%020x" % i)),
+    ("payments.list", lambda p, i: p.payments.list()),
+    ("preauthorizations.details", lambda p, i: p.preauthorizations.details("preauth_%020x" % i)),
+    ("preauthorizations.list", lambda p, i: p.preauthorizations.list()),
+    ("transactions.create", lambda p, i: p.transactions.create(4200, token="tok_%d" % i)),
+    ("transactions.details", lambda p, i: p.transactions.details("tran_%020x" % i)),
+    ("transactions.list", lambda p, i: p.transactions.list()),
+    ("refunds.transaction", lambda p, i: p.refunds.transaction("tran_%020x" % i, 4200)),
+    ("refunds.details", lambda p, i: p.refunds.details("refund_%020x" % i)),
+    ("refunds.list", lambda p, i: p.refunds.list()),
+    ("clients.create", lambda p, i: p.clients.create("client-%d@example.com" % i)),
+    ("clients.details", lambda p, i: p.clients.details("client_%020x" % i)),
+    ("clients.update", lambda p, i: p.clients.update("client_%020x" % i, "client-%d@example.com" % i)),
+    ("clients.remove", lambda p, i: p.clients.remove("client_%020x" % i)),
+    ("clients.list", lambda p, i: p.clients.list()),
+    ("offers.create", lambda p, i: p.offers.create(4980, "week", "offer %d" % i)),
+    ("offers.details", lambda p, i: p.offers.details("offer_%020x" % i)),
+    ("offers.update", lambda p, i: p.offers.update("offer_%020x" % i, "offer %d" % i)),
+    ("offers.list", lambda p, i: p.offers.list()),
+    ("subscriptions.create", lambda p, i: p.subscriptions.create("client_1", "offer_1", "pay_%d" % i)),
+    ("subscriptions.details", lambda p, i: p.subscriptions.details("sub_%020x" % i)),
+    ("subscriptions.update", lambda p, i: p.subscriptions.update("sub_%020x" % i, True)),
+    ("subscriptions.list", lambda p, i: p.subscriptions.list()),
+]
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100.0))]
+
+
+class Measurement(object):
+    """
+    wall clock, cpu time and net gc tracked allocations of a benchmark run
+    """
+
+    def __enter__(self):
+        gc.collect()
+        gc.disable()
+        self.latencies = []
+        self.objects = gc.get_count()[0]
+        self.blocks = getattr(sys, "getallocatedblocks", lambda: 0)()
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        self.cpu = usage.ru_utime + usage.ru_stime
+        self.started = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.time() - self.started
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        self.cpu = usage.ru_utime + usage.ru_stime - self.cpu
+        self.objects = gc.get_count()[0] - self.objects
+        self.blocks = getattr(sys, "getallocatedblocks", lambda: 0)() - self.blocks
+        gc.enable()
+
+    def result(self, name, mode, requests):
+        return {
+            "scenario": name,
+            "mode": mode,
+            "requests": requests,
+            "requests_per_second": requests / self.elapsed if self.elapsed else None,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "cpu_us_per_request": self.cpu / requests * 1000000,
+            "net_gc_objects_per_request": float(self.objects) / requests,
+            "net_allocated_blocks_per_request": float(self.blocks) / requests,
+        }
+
+
+def run_sync(name, fn, requests, workers):
+    client = paymill.Paymill("bench-key", coalesce=False)
+    with Measurement() as measurement:
+        for index in xrange(requests):
+            started = time.time()
+            fn(client, index)
+            measurement.latencies.append(time.time() - started)
+    client.transport.close()
+    return measurement.result(name, "sync", requests)
+
+
+def run_threaded(name, fn, requests, workers):
+    client = paymill.Paymill("bench-key", pool_size=workers, coalesce=False)
+
+    def timed(index):
+        started = time.time()
+        fn(client, index)
+        return time.time() - started
+
+    with Measurement() as measurement:
+        for result in client.batch(((timed, (index,)) for index in xrange(requests)), workers=workers):
+            measurement.latencies.append(result.result)
+    client.transport.close()
+    return measurement.result(name, "threaded", requests)
+
+
+class TimedAsyncPaymill(paymill.AsyncPaymill):
+    """
+    AsyncPaymill timing every request inside the worker running it, as the other modes do
+    time spent waiting for a worker is recorded separately
+    """
+
+    def __init__(self, *args, **kwargs):
+        paymill.AsyncPaymill.__init__(self, *args, **kwargs)
+        self.latencies = []
+        self.waits = []
+
+    def _response(self, request):
+        return self.workers.submit(self._timed, request, time.time())
+
+    def _timed(self, request, submitted):
+        started = time.time()
+        self.waits.append(started - submitted)
+        try:
+            return paymill.Paymill._response(self, request)
+        finally:
+            self.latencies.append(time.time() - started)
+
+
+def run_async(name, fn, requests, workers):
+    client = TimedAsyncPaymill("bench-key", workers=workers, coalesce=False)
+    with Measurement() as measurement:
+        futures = [fn(client, index) for index in xrange(requests)]
+        for future in futures:
+            future.result()
+        measurement.latencies.extend(client.latencies)
+    client.workers.shutdown()
+    client.transport.close()
+    result = measurement.result(name, "async", requests)
+    result.update({
+        "queue_p50_ms": percentile(client.waits, 50) * 1000,
+        "queue_p99_ms": percentile(client.waits, 99) * 1000,
+    })
+    return result
+
+
+MODES = {
+    "sync": run_sync,
+    "threaded": run_threaded,
+    "async": run_async,
+}
+
+
+def legacy_client(client, method, id="", params=None):
+    """
+    request building as done before auth header and url prefixes were precomputed
+    """
+    if params:
+        params = "?%s" % urllib.urlencode(params)
+    url = "%s%s/%s/%s" % (client.API_URL, method, id, params or "")
+    request = urllib2.Request(url, headers=client.HEADERS)
+    base64string = base64.encodestring("%s:%s" % (client.PRIVATE_KEY, "")).replace("\n", "")
+    request.add_header("Authorization", "Basic %s" % base64string)
+    return request
+
+
+def micro(iterations):
+    """
+    measures client side cost of building a request, legacy versus prepared
+
+    returns list of result dicts
+    """
+    client = paymill.Paymill("bench-key")
+    cases = [
+        ("details", ("transactions", "tran_023d3b5769321c649435"), {}),
+        ("list", ("transactions",), {"params": {"count": 100, "offset": 200}}),
+    ]
+    results = []
+    for name, args, kwargs in cases:
+        legacy = min(timeit.repeat(lambda: legacy_client(client, *args, **kwargs), number=iterations, repeat=3))
+        prepared = min(timeit.repeat(lambda: client.client(*args, **kwargs), number=iterations, repeat=3))
+        results.append({
+            "scenario": "client.%s" % name,
+            "legacy_ns_per_call": legacy / iterations * 1e9,
+            "prepared_ns_per_call": prepared / iterations * 1e9,
+            "saved_ns_per_call": (legacy - prepared) / iterations * 1e9,
+        })
+    return results
+
+
+def compare(previous, current, tolerance):
+    """
+    prints throughput changes between two result files
+
+    returns list of regressed (scenario, mode) tuples
+    """
+    before = dict(((r["scenario"], r["mode"]), r) for r in previous["results"])
+    regressions = []
+    for result in current["results"]:
+        key = (result["scenario"], result["mode"])
+        if key not in before or not before[key]["requests_per_second"]:
+            continue
+        change = result["requests_per_second"] / before[key]["requests_per_second"] - 1
+        print "%-28s %-9s %+7.1f%% req/s" % (key[0], key[1], change * 100)
+        if change < -tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paymill library benchmarks against a local stub server")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and mode")
+    parser.add_argument("--workers", type=int, default=8, help="threads for threaded and async modes")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server latency in seconds")
+    parser.add_argument("--padding", type=int, default=0, help="extra payload bytes per entity")
+    parser.add_argument("--list-size", type=int, default=20, help="entities per list page")
+    parser.add_argument("--modes", default="sync,threaded,async", help="comma separated modes to run")
+    parser.add_argument("--scenarios", default="", help="comma separated scenario name prefixes to run")
+    parser.add_argument("--output", help="write results as json to this file")
+    parser.add_argument("--compare", help="compare results with a previous json result file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="req/s drop reported as regression")
+    parser.add_argument("--micro", type=int, default=0, metavar="N", help="also time N request builds")
+    args = parser.parse_args(argv)
+
+    process, url = start_server(args.latency, args.padding, args.list_size)
+    paymill.Paymill.API_URL = url
+    prefixes = [prefix for prefix in args.scenarios.split(",") if prefix]
+    results = []
+    try:
+        for name, fn in SCENARIOS:
+            if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                continue
+            for mode in args.modes.split(","):
+                result = MODES[mode](name, fn, args.requests, args.workers)
+                results.append(result)
+                print "%-28s %-9s %9.1f req/s  p50 %7.2f ms  p99 %7.2f ms  cpu %7.1f us/req  gc %6.1f obj/req%s" % (
+                    name, mode, result["requests_per_second"], result["p50_ms"], result["p99_ms"],
+                    result["cpu_us_per_request"], result["net_gc_objects_per_request"],
+                    "  queue p50 %7.2f ms  p99 %7.2f ms" % (result["queue_p50_ms"], result["queue_p99_ms"])
+                    if "queue_p50_ms" in result else ""
+                )
+    finally:
+        process.terminate()
+
+    micro_results = micro(args.micro) if args.micro else []
+    for result in micro_results:
+        print "%-28s legacy %7.0f ns  prepared %7.0f ns  saved %7.0f ns per call" % (
+            result["scenario"], result["legacy_ns_per_call"], result["prepared_ns_per_call"],
+            result["saved_ns_per_call"]
+        )
+
+    report = {
+        "created_at": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": vars(args),
+        "results": results,
+        "micro": micro_results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as fp:
+            regressions = compare(json.load(fp), report, args.tolerance)
+        if regressions:
+            print "regressions: %s" % ", ".join("%s/%s" % key for key in regressions)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
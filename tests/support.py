@@ -0,0 +1,76 @@
+import json
+import socket
+import threading
+import unittest
+
+import benchmark
+import paymill
+
+
+class RecordingHandler(benchmark.StubHandler):
+    """
+    stub handler remembering method, path and client port of every request
+    """
+
+    def setup(self):
+        benchmark.StubHandler.setup(self)
+        with self.server.lock:
+            self.server.connections.append(self.connection)
+
+    def handle_request(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, self.client_address[1]))
+        return benchmark.StubHandler.handle_request(self)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+
+class StubTestCase(unittest.TestCase):
+    """
+    runs a benchmark.StubServer on a thread for every test
+    """
+    latency = 0.0
+
+    def setUp(self):
+        self.server = benchmark.StubServer(latency=self.latency, total=50)
+        self.server.RequestHandlerClass = RecordingHandler
+        self.server.requests = []
+        self.server.connections = []
+        self.server.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self._api_url = paymill.Paymill.API_URL
+        paymill.Paymill.API_URL = self.server.url
+
+    def tearDown(self):
+        paymill.Paymill.API_URL = self._api_url
+        self.server.shutdown()
+        self.server.server_close()
+        # keep-alive connections left open by clients would keep handler threads reading until exit
+        with self.server.lock:
+            connections = list(self.server.connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+    def requests(self, method=None):
+        with self.server.lock:
+            return [request for request in self.server.requests if method is None or request[0] == method]
+
+
+class FakeTransport(paymill.Transport):
+    """
+    transport answering from a list of responses, remembering every request sent
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        self.sent.append((method, url, dict(headers or {}), body))
+        status, data = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return paymill.Response(status, {}, json.dumps(data), "")
@@ -0,0 +1,67 @@
+import time
+import unittest
+
+import paymill
+
+
+class AccountsTest(unittest.TestCase):
+
+    def test_client_per_private_key(self):
+        accounts = paymill.Accounts(pool_size=2, timeout=5)
+        first, second = accounts.get("key-1"), accounts.get("key-2")
+
+        self.assertIs(accounts.get("key-1"), first)
+        self.assertIsNot(first.transport, second.transport)
+        self.assertEqual((first.PRIVATE_KEY, second.PRIVATE_KEY), ("key-1", "key-2"))
+        self.assertNotEqual(first.account, second.account)
+        self.assertEqual(first.timeout, 5)
+
+    def test_rate_limiter_per_account(self):
+        accounts = paymill.Accounts(rate=10)
+        self.assertIsNot(accounts.get("key-1").rate_limiter, accounts.get("key-2").rate_limiter)
+        self.assertIsNone(paymill.Accounts().get("key-1").rate_limiter)
+
+    def test_least_recently_used_is_evicted(self):
+        accounts = paymill.Accounts(size=2)
+        accounts.get("key-1")
+        accounts.get("key-2")
+        accounts.get("key-1")
+        accounts.get("key-3")
+
+        self.assertEqual(len(accounts), 2)
+        self.assertIn("key-1", accounts)
+        self.assertNotIn("key-2", accounts)
+
+    def test_idle_accounts_are_evicted(self):
+        accounts = paymill.Accounts(idle_timeout=0.05)
+        accounts.get("key-1")
+        time.sleep(0.06)
+        accounts.get("key-2")
+
+        self.assertNotIn("key-1", accounts)
+        self.assertIn("key-2", accounts)
+        time.sleep(0.06)
+        self.assertEqual(accounts.evict(), 1)
+        self.assertEqual(len(accounts), 0)
+
+    def test_evict_and_close(self):
+        accounts = paymill.Accounts()
+        accounts.get("key-1")
+        accounts.get("key-2")
+
+        self.assertEqual(accounts.evict("key-1"), 1)
+        self.assertEqual(accounts.evict("key-1"), 0)
+        accounts.close()
+        self.assertEqual(len(accounts), 0)
+
+    def test_shared_mirror_is_refused(self):
+        self.assertRaises(ValueError, paymill.Accounts, mirror=paymill.Mirror(":memory:"))
+        self.assertRaises(ValueError, paymill.Accounts, transport=paymill.UrllibTransport())
+
+    def test_factory_builds_clients(self):
+        accounts = paymill.Accounts(factory=lambda private_key: paymill.Paymill(private_key, models=True))
+        self.assertTrue(accounts.get("key-1").models)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import time
+import unittest
+
+import paymill
+from tests.support import FakeTransport, StubTestCase
+
+
+class AsyncPaymillTest(StubTestCase):
+    latency = 0.2
+
+    def test_calls_run_concurrently(self):
+        client = paymill.AsyncPaymill("key", workers=5)
+        self.addCleanup(client.workers.shutdown)
+        started = time.time()
+        futures = [client.clients.details("client_%s" % index) for index in range(5)]
+
+        self.assertTrue(all(isinstance(future, paymill.Future) for future in futures))
+        ids = [future.result(5)["data"]["id"] for future in futures]
+        self.assertEqual(ids, ["client_%s" % index for index in range(5)])
+        self.assertLess(time.time() - started, 0.8)
+
+    def test_arguments_are_validated_in_calling_thread(self):
+        client = paymill.AsyncPaymill("key", workers=1)
+        self.addCleanup(client.workers.shutdown)
+        self.assertRaises(ValueError, client.transactions.create, None, token="tok_1")
+        self.assertEqual(self.requests(), [])
+
+
+class FutureTest(unittest.TestCase):
+
+    def test_errors_are_raised_by_result(self):
+        client = paymill.AsyncPaymill("key", workers=1, transport=FakeTransport([(404, {"error": "not found"})]))
+        self.addCleanup(client.workers.shutdown)
+        future = client.clients.details("client_1")
+
+        self.assertRaises(paymill.ApiError, future.result, 5)
+        self.assertIsInstance(future.exception(), paymill.ApiError)
+
+    def test_callbacks_run_once_done(self):
+        future, called = paymill.Future(), []
+        future.add_done_callback(called.append)
+        self.assertEqual(called, [])
+        future.set_result(1)
+        future.add_done_callback(called.append)
+        self.assertEqual(called, [future, future])
+        self.assertEqual(paymill.resolve(future), 1)
+        self.assertEqual(paymill.resolve(2), 2)
+
+    def test_pending_result_times_out(self):
+        self.assertRaises(RuntimeError, paymill.Future().result, 0.01)
+
+    def test_shared_worker_pool(self):
+        pool = paymill.WorkerPool(2)
+        self.addCleanup(pool.shutdown)
+        transport = FakeTransport([(200, {"data": {"id": "client_1"}})])
+        clients = [paymill.AsyncPaymill(key, workers=pool, transport=transport) for key in ("key-1", "key-2")]
+        for client in clients:
+            client.clients.details("client_1").result(5)
+
+        self.assertTrue(all(client.workers is pool for client in clients))
+        self.assertEqual(len(transport.sent), 2)
+        self.assertEqual(len(pool._threads), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
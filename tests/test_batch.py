@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+
+import paymill
+
+
+def sleep_and_return(value, delay=0.0):
+    time.sleep(delay)
+    return value
+
+
+def fail(error):
+    raise error
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_ordered_results_follow_input(self):
+        operations = [(sleep_and_return, (index,), {"delay": 0.01 * (5 - index)}) for index in range(6)]
+        results = list(paymill.Batch(workers=3).run(operations))
+        self.assertEqual([result.index for result in results], range(6))
+        self.assertEqual([result.result for result in results], range(6))
+
+    def test_unordered_results_come_as_completed(self):
+        operations = [(sleep_and_return, (0, 0.2)), (sleep_and_return, (1,))]
+        results = list(paymill.Batch(workers=2).run(operations, ordered=False))
+        self.assertEqual([result.index for result in results], [1, 0])
+
+    def test_operation_forms(self):
+        future = paymill.Future()
+        future.set_result("resolved")
+        operations = [lambda: "callable", (sleep_and_return, ["args"]), (sleep_and_return, (), {"value": "kwargs"}),
+                      (lambda: future, None)]
+        results = [result.result for result in paymill.Batch(workers=2).run(operations)]
+        self.assertEqual(results, ["callable", "args", "kwargs", "resolved"])
+        self.assertRaises(ValueError, list, paymill.Batch().run(["junk"]))
+
+    def test_captured_errors_are_reported(self):
+        error = paymill.ApiError(paymill.ApiError.ERR_TRANSACTION_ERROR)
+        results = list(paymill.Batch(workers=2).run([(fail, (error,)), (sleep_and_return, (1,))]))
+        self.assertFalse(results[0].ok)
+        self.assertIs(results[0].error, error)
+        self.assertTrue(results[1].ok)
+
+    def test_other_errors_abort_batch(self):
+        operations = [(fail, (KeyError("bug"),))]
+        self.assertRaises(KeyError, list, paymill.Batch().run(operations))
+        results = list(paymill.Batch(capture=(KeyError,)).run(operations))
+        self.assertIsInstance(results[0].error, KeyError)
+
+    def test_operations_are_consumed_lazily(self):
+        consumed, release = [], threading.Event()
+
+        def operations():
+            for index in range(100):
+                consumed.append(index)
+                yield release.wait, (5,)
+
+        results = paymill.Batch(workers=2).run(operations())
+        threading.Timer(0.1, release.set).start()
+        next(results)
+        self.assertLessEqual(len(consumed), 5)
+        results.close()
+        self.assertLessEqual(len(consumed), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
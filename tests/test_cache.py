@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import paymill
+from tests.support import StubTestCase
+
+
+class CacheTest(StubTestCase):
+
+    def test_details_are_cached(self):
+        client = paymill.Paymill("key", cache=paymill.ResponseCache())
+        for _ in range(3):
+            client.get("clients", "client_1")
+
+        self.assertEqual(len(self.requests("GET")), 1)
+
+    def test_write_invalidates_entity_and_lists(self):
+        client = paymill.Paymill("key", cache=paymill.ResponseCache())
+        clients = paymill.Clients(client)
+        clients.details("client_1")
+        clients.list()
+        clients.update("client_1", "a@b.c")
+        clients.details("client_1")
+        clients.list()
+
+        self.assertEqual(len(self.requests("GET")), 4)
+
+    def test_refund_invalidates_transaction(self):
+        client = paymill.Paymill("key", cache=paymill.ResponseCache())
+        # the stub refunds this transaction whichever id is posted
+        transaction_id = "tran_023d3b5769321c649435"
+        paymill.Transactions(client).details(transaction_id)
+        paymill.Refunds(client).transaction(transaction_id, 100)
+        paymill.Transactions(client).details(transaction_id)
+
+        self.assertEqual(len(self.requests("GET")), 2)
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = paymill.ResponseCache(size=2)
+        cache.set("clients", "client_1", "clients/client_1", "1")
+        cache.set("clients", "client_2", "clients/client_2", "2")
+        cache.get("clients", "clients/client_1")
+        cache.set("clients", "client_3", "clients/client_3", "3")
+
+        self.assertEqual(cache.get("clients", "clients/client_1"), "1")
+        self.assertIsNone(cache.get("clients", "clients/client_2"))
+        self.assertEqual(cache.stats(), {"size": 2, "hits": 2, "misses": 1})
+
+    def test_entries_expire(self):
+        cache = paymill.ResponseCache(ttl=0.05, ttls=dict(transactions=0))
+        cache.set("clients", "client_1", "clients/client_1", "1")
+        cache.set("transactions", "tran_1", "transactions/tran_1", "1")
+        self.assertEqual(cache.get("clients", "clients/client_1"), "1")
+        self.assertIsNone(cache.get("transactions", "transactions/tran_1"))
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("clients", "clients/client_1"))
+
+    def test_invalidate_drops_entity_and_lists(self):
+        cache = paymill.ResponseCache()
+        cache.set("clients", "client_1", "clients/client_1", "1")
+        cache.set("clients", "client_2", "clients/client_2", "2")
+        cache.set("clients", "", "clients/", "[]")
+        cache.invalidate("clients", "client_1")
+
+        self.assertIsNone(cache.get("clients", "clients/client_1"))
+        self.assertIsNone(cache.get("clients", "clients/"))
+        self.assertEqual(cache.get("clients", "clients/client_2"), "2")
+
+
+class SqliteCacheTest(StubTestCase):
+
+    def setUp(self):
+        StubTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "cache.db")
+
+    def test_entries_are_shared_between_instances(self):
+        first = paymill.Paymill("key", cache=paymill.SqliteCache(self.path))
+        second = paymill.Paymill("key", cache=paymill.SqliteCache(self.path))
+        first.get("clients", "client_1")
+        second.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 1)
+        self.assertEqual(second.cache.stats(), {"size": 1, "hits": 1, "misses": 0})
+
+    def test_write_invalidates_entries_of_other_instances(self):
+        first = paymill.Paymill("key", cache=paymill.SqliteCache(self.path))
+        second = paymill.Paymill("key", cache=paymill.SqliteCache(self.path))
+        first.get("clients", "client_1")
+        second.put("clients", {"email": "a@b.c"}, "client_1")
+        first.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 2)
+
+    def test_fill_is_dropped_after_concurrent_invalidation(self):
+        cache = paymill.SqliteCache(self.path)
+        version = cache.version("clients")
+        paymill.SqliteCache(self.path).invalidate("clients", "client_1")
+        cache.set("clients", "client_1", "clients/client_1", "{}", version)
+        self.assertIsNone(cache.get("clients", "clients/client_1"))
+
+    def test_zero_ttl_disables_caching(self):
+        client = paymill.Paymill("key", cache=paymill.SqliteCache(self.path, ttls=dict(clients=0)))
+        client.get("clients", "client_1")
+        client.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 2)
+
+    def test_entries_are_scoped_to_account(self):
+        cache = paymill.ResponseCache()
+        first, second = paymill.Paymill("key-1", cache=cache), paymill.Paymill("key-2", cache=cache)
+        first.get("clients", "client_1")
+        second.get("clients", "client_1")
+        first.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 2)
+
+        second.put("clients", {"email": "a@b.c"}, "client_1")
+        first.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 2)
+
+        cache = paymill.SqliteCache(self.path)
+        first, second = paymill.Paymill("key-1", cache=cache), paymill.Paymill("key-2", cache=cache)
+        first.get("clients", "client_1")
+        second.get("clients", "client_1")
+        self.assertEqual(len(self.requests("GET")), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
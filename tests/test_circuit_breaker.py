@@ -0,0 +1,135 @@
+import time
+import unittest
+
+import paymill
+from tests.support import FakeTransport
+
+
+class FailingTransport(paymill.Transport):
+    """
+    transport raising an exception which is neither socket.error nor HTTPException
+    """
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        raise ValueError("unexpected")
+
+
+class TimeoutTransport(FakeTransport):
+    """
+    fake transport remembering socket timeout of every request
+    """
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        self.timeouts.append(timeout)
+        return FakeTransport.send(self, method, url, headers, body, timeout)
+
+
+class TimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = TimeoutTransport([(200, {"data": {"id": "tran_1"}})])
+        self.transport.timeouts = []
+        self.client = paymill.Paymill("key", transport=self.transport, timeout=10)
+
+    def test_instance_timeout_is_default(self):
+        paymill.Transactions(self.client).details("tran_1")
+        paymill.Clients(self.client).list()
+        self.assertEqual(self.transport.timeouts, [10, 10])
+
+    def test_endpoint_methods_pass_timeout(self):
+        paymill.Transactions(self.client).details("tran_1", timeout=2)
+        paymill.Transactions(self.client).list(filters=dict(count=1), timeout=3)
+        paymill.Transactions(self.client).create(100, token="tok_1", timeout=4)
+        paymill.Refunds(self.client).transaction("tran_1", 100, timeout=5)
+        paymill.Clients(self.client).update("client_1", "a@b.c", timeout=6)
+        paymill.Offers(self.client).remove("offer_1", timeout=7)
+        self.assertEqual(self.transport.timeouts, [2, 3, 4, 5, 6, 7])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def breaker(self, **kwargs):
+        kwargs.setdefault("min_requests", 4)
+        kwargs.setdefault("open_for", 0.05)
+        return paymill.CircuitBreaker(**kwargs)
+
+    def open(self, breaker, endpoint="transactions"):
+        for _ in range(breaker.min_requests):
+            breaker.allow(endpoint)
+            breaker.record(endpoint, False, 0.01)
+
+    def assertRefused(self, breaker, endpoint="transactions"):
+        try:
+            breaker.allow(endpoint)
+        except paymill.ApiError, e:
+            self.assertEqual(e.msg, paymill.ApiError.ERR_CIRCUIT_OPEN[1])
+        else:
+            self.fail("request should be refused")
+
+    def test_failures_open_circuit(self):
+        breaker = self.breaker()
+        for _ in range(3):
+            breaker.allow("transactions")
+            breaker.record("transactions", False, 0.01)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.CLOSED)
+
+        breaker.record("transactions", False, 0.01)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.OPEN)
+        self.assertRefused(breaker)
+        self.assertEqual(breaker.state("clients"), paymill.CircuitBreaker.CLOSED)
+
+    def test_ratio_below_threshold_keeps_circuit_closed(self):
+        breaker = self.breaker(failure_ratio=0.5)
+        for success in [True, True, False, True, True, False]:
+            breaker.record("transactions", success, 0.01)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.CLOSED)
+
+    def test_slow_responses_count_as_failures(self):
+        breaker = self.breaker(latency=1)
+        for _ in range(4):
+            breaker.record("transactions", True, 2)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.OPEN)
+
+    def test_successful_probe_closes_circuit(self):
+        breaker = self.breaker()
+        self.open(breaker)
+        time.sleep(0.06)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.HALF_OPEN)
+
+        breaker.allow("transactions")
+        self.assertRefused(breaker)
+        breaker.record("transactions", True, 0.01)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.CLOSED)
+
+    def test_failed_probe_opens_circuit_again(self):
+        breaker = self.breaker()
+        self.open(breaker)
+        time.sleep(0.06)
+        breaker.allow("transactions")
+        breaker.record("transactions", False, 0.01)
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.OPEN)
+
+    def test_unexpected_exception_releases_probe(self):
+        breaker = self.breaker()
+        client = paymill.Paymill("key", transport=FailingTransport(), circuit_breaker=breaker)
+        self.open(breaker)
+        time.sleep(0.06)
+
+        self.assertRaises(ValueError, client.get, "transactions", "tran_1")
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.OPEN)
+        time.sleep(0.06)
+        client.transport = FakeTransport([(200, {"data": {}})])
+        client.get("transactions", "tran_1")
+        self.assertEqual(breaker.state("transactions"), paymill.CircuitBreaker.CLOSED)
+
+    def test_server_errors_open_circuit_through_client(self):
+        breaker = self.breaker()
+        client = paymill.Paymill("key", transport=FakeTransport([(500, {})]), circuit_breaker=breaker)
+        for _ in range(4):
+            self.assertRaises(paymill.ApiError, client.get, "transactions", "tran_1")
+        self.assertRaises(paymill.ApiError, client.get, "transactions", "tran_1")
+        self.assertEqual(len(client.transport.sent), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
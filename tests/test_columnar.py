@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import benchmark
+import paymill
+from tests.support import StubTestCase
+
+
+class ColumnarExportTest(StubTestCase):
+
+    def setUp(self):
+        StubTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = paymill.Paymill("key")
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_writer_round_trip(self):
+        entities = [benchmark.entity("transactions", "tran_%s" % index) for index in range(5)]
+        entities[1]["currency"] = "USD"
+        with paymill.TableWriter(self.path("transactions")) as writer:
+            writer.write(entities[:3])
+            writer.write(entities[3:])
+
+        table = paymill.Table.load(self.path("transactions"))
+        self.assertEqual(table.ids, ["tran_%s" % index for index in range(5)])
+        self.assertEqual(list(table.columns["amount"]), [4200] * 5)
+        self.assertEqual(list(table.columns["created_at"]), [entity["created_at"] for entity in entities])
+        self.assertEqual(table.values("currency"), ["EUR", "USD", "EUR", "EUR", "EUR"])
+        self.assertEqual(table.sum_by("currency"), {"EUR": 16800, "USD": 4200})
+
+    def test_save_and_load(self):
+        table = paymill.Table.from_entities([benchmark.entity("transactions", "tran_1")])
+        table.save(self.path("saved"))
+        loaded = paymill.Table.load(self.path("saved"))
+        self.assertEqual(loaded.ids, table.ids)
+        self.assertEqual(loaded.total(), 4200)
+        self.assertEqual(loaded.values("client"), table.values("client"))
+
+    def test_failed_export_has_no_manifest(self):
+        def progress(exported, elapsed, rate):
+            raise RuntimeError("interrupted")
+
+        self.assertRaises(RuntimeError, paymill.Transactions(self.client).export_columns,
+                          self.path("failed"), count=20, progress=progress)
+        self.assertRaises(IOError, paymill.Table.load, self.path("failed"))
+
+    def test_export_transactions(self):
+        exported = paymill.Transactions(self.client).export_columns(self.path("transactions"), count=20, workers=2)
+        table = paymill.Table.load(self.path("transactions"))
+        self.assertEqual(exported, 50)
+        self.assertEqual(len(table), 50)
+        self.assertEqual(table.total(), 50 * 4200)
+        self.assertEqual(table.count_by("status"), {"closed": 50})
+
+    def test_export_clients_keeps_client_columns(self):
+        paymill.Clients(self.client).export_columns(self.path("clients"), count=20)
+        table = paymill.Table.load(self.path("clients"))
+        self.assertEqual(sorted(table.columns), ["created_at", "description", "email", "updated_at"])
+        self.assertEqual(set(table.values("email")), set(["lovely-client@example.com"]))
+        self.assertEqual(len(table), 50)
+
+    def test_export_subscriptions_keeps_subscription_columns(self):
+        paymill.Subscriptions(self.client).export_columns(self.path("subscriptions"), count=20)
+        table = paymill.Table.load(self.path("subscriptions"))
+        entity = benchmark.entity("subscriptions", table.ids[0])
+        self.assertEqual(table.columns["next_capture_at"][0], entity["next_capture_at"])
+        self.assertEqual(table.values("offer")[0], entity["offer"]["id"])
+        self.assertIn("canceled_at", table.columns)
+        self.assertNotIn("amount", table.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import unittest
+
+import paymill
+from tests.support import FakeTransport
+
+
+class DecodingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport([(200, {"data": {"id": "client_1"}})])
+
+    def test_custom_decoder(self):
+        bodies = []
+
+        def decoder(body):
+            bodies.append(body)
+            return json.loads(body)
+
+        client = paymill.Paymill("key", transport=self.transport, decoder=decoder)
+        self.assertEqual(client.clients.details("client_1")["data"]["id"], "client_1")
+        self.assertEqual(bodies, ['{"data": {"id": "client_1"}}'])
+        self.assertRaises(ValueError, paymill.Paymill, "key", transport=self.transport, decoder="json")
+
+    def test_raw_mode_returns_body(self):
+        client = paymill.Paymill("key", transport=self.transport, raw=True, cache=paymill.ResponseCache())
+        for _ in range(2):
+            self.assertEqual(client.clients.details("client_1"), '{"data": {"id": "client_1"}}')
+        self.assertEqual(len(self.transport.sent), 1)
+
+    def test_raw_mode_raises_for_errors(self):
+        client = paymill.Paymill("key", transport=FakeTransport([(404, {})]), raw=True)
+        self.assertRaises(paymill.ApiError, client.clients.details, "client_1")
+
+    def test_default_decoder_is_json_compatible(self):
+        self.assertEqual(paymill.json_decoder()('{"data": [1, "a", null]}'), {"data": [1, "a", None]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import StringIO
+import csv
+import json
+import unittest
+
+import paymill
+from tests.support import FakeTransport, StubTestCase
+
+
+class ExportTest(StubTestCase):
+
+    def setUp(self):
+        StubTestCase.setUp(self)
+        self.client = paymill.Paymill("key")
+
+    def test_csv(self):
+        fp = StringIO.StringIO()
+        self.assertEqual(paymill.Clients(self.client).export(fp, count=20, workers=2), 50)
+
+        rows = list(csv.reader(StringIO.StringIO(fp.getvalue())))
+        self.assertEqual(rows[0], paymill.Clients.EXPORT_FIELDS)
+        self.assertEqual(len(rows), 51)
+        self.assertEqual(len(set(row[0] for row in rows[1:])), 50)
+        self.assertEqual(len(self.requests("GET")), 3)
+
+    def test_jsonl_with_models(self):
+        fp, progress = StringIO.StringIO(), []
+        client = paymill.Paymill("key", models=True)
+        paymill.Clients(client).export(fp, format="jsonl", count=20,
+                                       progress=lambda exported, elapsed, rate: progress.append(exported))
+
+        clients = [json.loads(line) for line in fp.getvalue().splitlines()]
+        self.assertEqual(len(clients), 50)
+        self.assertEqual(clients[0]["email"], "lovely-client@example.com")
+        self.assertEqual(progress, [20, 40, 50])
+
+    def test_invalid_arguments(self):
+        clients = paymill.Clients(self.client)
+        self.assertRaises(ValueError, clients.export, None)
+        self.assertRaises(ValueError, clients.export, StringIO.StringIO(), format="xml")
+        self.assertRaises(ValueError, clients.export, StringIO.StringIO(), progress=1)
+
+
+class ExportValueTest(unittest.TestCase):
+
+    def test_nested_values_are_flattened(self):
+        client = {"id": "client_1", "email": u"j\xfcrgen@example.com", "description": None,
+                  "payment": [{"id": "pay_1"}, {"id": "pay_2"}], "subscription": {"id": "sub_1"}}
+        fp = StringIO.StringIO()
+        paymill.Clients(paymill.Paymill("key", transport=FakeTransport([(200, {"data": [client]})]))).export(fp)
+
+        row = list(csv.reader(StringIO.StringIO(fp.getvalue())))[1]
+        self.assertEqual(row, ["client_1", "j\xc3\xbcrgen@example.com", "", "", "", "pay_1 pay_2", "sub_1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
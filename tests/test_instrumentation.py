@@ -0,0 +1,68 @@
+import unittest
+
+import paymill
+from tests.support import FakeTransport, StubTestCase
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_percentiles_within_bucket_precision(self):
+        histogram = paymill.Histogram()
+        for value in range(1, 101):
+            histogram.record(value / 1000.0)
+
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (100, 0.001, 0.1))
+        for percent, expected in ((50, 0.05), (90, 0.09), (99, 0.099)):
+            self.assertGreaterEqual(histogram.percentile(percent), expected)
+            self.assertLess(histogram.percentile(percent), expected * 2 ** (1 / 8.0))
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_empty(self):
+        self.assertIsNone(paymill.Histogram().percentile(50))
+        self.assertEqual(paymill.Histogram().as_dict()["count"], 0)
+
+
+class InstrumentationTest(StubTestCase):
+
+    def test_phases_are_recorded_per_endpoint_and_verb(self):
+        instrumentation = paymill.Instrumentation()
+        client = paymill.Paymill("key", instrumentation=instrumentation)
+        client.get("clients", "client_1")
+        client.get("clients", "client_2")
+        client.delete("offers", "offer_1")
+
+        metrics = instrumentation.as_dict()
+        self.assertEqual(metrics["clients"]["GET"]["requests"], 2)
+        self.assertGreater(metrics["clients"]["GET"]["bytes"], 0)
+        phases = set(metrics["clients"]["GET"]["latency"])
+        self.assertTrue(set(["connect", "ttfb", "read", "total", "decode"]) <= phases)
+        self.assertEqual(metrics["offers"]["DELETE"]["latency"]["total"]["count"], 1)
+
+    def test_hooks_and_errors(self):
+        calls = []
+        instrumentation = paymill.Instrumentation(
+            before=[lambda request: calls.append(("before", request.endpoint))],
+            after=[lambda request, response, error, elapsed: calls.append(("after", response.status))],
+        )
+        client = paymill.Paymill("key", instrumentation=instrumentation, transport=FakeTransport([(404, {})]))
+        self.assertRaises(paymill.ApiError, client.get, "clients", "client_1")
+
+        self.assertEqual(calls, [("before", "clients"), ("after", 404)])
+        self.assertEqual(instrumentation.as_dict()["clients"]["GET"]["errors"], {"404": 1})
+
+    def test_prometheus(self):
+        instrumentation = paymill.Instrumentation()
+        paymill.Paymill("key", instrumentation=instrumentation).get("clients", "client_1")
+        lines = instrumentation.prometheus().splitlines()
+
+        self.assertIn('paymill_requests_total{endpoint="clients",verb="GET"} 1', lines)
+        self.assertIn('paymill_request_duration_seconds_count{endpoint="clients",verb="GET",phase="total"} 1', lines)
+        labels = 'endpoint="clients",verb="GET",phase="total"'
+        self.assertIn('paymill_request_duration_seconds_bucket{%s,le="+Inf"} 1' % labels, lines)
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.as_dict(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import paymill
+from tests.support import StubTestCase
+
+
+class MirrorTest(StubTestCase):
+
+    def setUp(self):
+        StubTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.mirror = paymill.Mirror(os.path.join(self.directory, "mirror.db"))
+        self.mirror.store("transactions", [
+            {"id": "tran_1", "client": {"id": "client_1"}, "created_at": 100, "status": "closed", "amount": "4200",
+             "currency": "EUR"},
+            {"id": "tran_2", "client": "client_2", "created_at": 200, "status": "failed", "amount": 100,
+             "currency": "USD"},
+            {"id": "tran_3", "client": {"id": "client_1"}, "created_at": 300, "status": "closed", "amount": 900,
+             "currency": "EUR"},
+            {"no": "id"},
+        ])
+
+    def ids(self, entities):
+        return [entity["id"] for entity in entities]
+
+    def test_query_filters(self):
+        self.assertEqual(self.ids(self.mirror.query("transactions", client="client_1")), ["tran_1", "tran_3"])
+        self.assertEqual(self.ids(self.mirror.query("transactions", since=150, until=300)), ["tran_2"])
+        self.assertEqual(self.ids(self.mirror.query("transactions", min_amount=900, currency="EUR")),
+                         ["tran_1", "tran_3"])
+        self.assertEqual(self.mirror.query("transactions", status="open"), [])
+        self.assertEqual(self.mirror.count("transactions", status="closed"), (2, 5100))
+        self.assertEqual(self.mirror.count("clients"), (0, 0))
+
+    def test_query_order_and_limit(self):
+        entities = self.mirror.query("transactions", order="amount", descending=True, limit=2, offset=1)
+        self.assertEqual(self.ids(entities), ["tran_3", "tran_2"])
+        self.assertEqual(entities[0]["client"], {"id": "client_1"})
+        self.assertRaises(ValueError, self.mirror.query, "transactions", order="client")
+
+    def test_client_feeds_mirror(self):
+        client = paymill.Paymill("key", mirror=self.mirror)
+        client.clients.list(filters=dict(count=5))
+        client.clients.details("client_x")
+        self.assertEqual(self.mirror.count("clients", account=client.account)[0], 6)
+
+        client.clients.remove("client_x")
+        self.assertIsNone(self.mirror.get("clients", "client_x"))
+        self.assertEqual(self.mirror.count("clients")[0], 5)
+
+
+class MirrorAccountTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.mirror = paymill.Mirror(os.path.join(self.directory, "mirror.db"))
+
+    def test_rows_are_kept_per_account(self):
+        self.mirror.store("transactions", [{"id": "tran_1", "amount": 100}], "acct-a")
+        self.mirror.store("transactions", [{"id": "tran_1", "amount": 200}], "acct-b")
+
+        self.assertEqual(self.mirror.get("transactions", "tran_1", "acct-a")["amount"], 100)
+        self.assertEqual(self.mirror.get("transactions", "tran_1", "acct-b")["amount"], 200)
+        self.assertEqual(self.mirror.count("transactions"), (2, 300))
+        self.assertEqual(self.mirror.count("transactions", account="acct-a"), (1, 100))
+
+        self.mirror.remove("transactions", "tran_1", "acct-a")
+        self.assertIsNone(self.mirror.get("transactions", "tran_1", "acct-a"))
+        self.assertIsNotNone(self.mirror.get("transactions", "tran_1", "acct-b"))
+
+    def test_primary_key_includes_account(self):
+        connection = sqlite3.connect(self.mirror.path)
+        primary_key = sorted((row[5], row[1]) for row in connection.execute("PRAGMA table_info(entities)") if row[5])
+        self.assertEqual([column for _, column in primary_key], ["account", "endpoint", "id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
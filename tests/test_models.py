@@ -0,0 +1,63 @@
+import datetime
+import unittest
+
+import benchmark
+import paymill
+from tests.support import FakeTransport, StubTestCase
+
+
+class ModelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = benchmark.entity("transactions", "tran_1")
+        self.transaction = paymill.Transaction(dict(self.data))
+
+    def test_fields(self):
+        self.assertEqual(self.transaction.id, "tran_1")
+        self.assertEqual(self.transaction.amount, 4200)
+        self.assertEqual(self.transaction.created_at,
+                         datetime.datetime.utcfromtimestamp(self.data["created_at"]))
+        self.assertFalse(hasattr(self.transaction, "__dict__"))
+
+    def test_nested_entities_are_decoded_on_access(self):
+        self.assertIsInstance(self.transaction._client, dict)
+        client = self.transaction.client
+        self.assertIsInstance(client, paymill.Client)
+        self.assertIs(self.transaction.client, client)
+        self.assertEqual(client.id, self.data["client"]["id"])
+
+        refund = paymill.Refund({"id": "refund_1", "transaction": "tran_1"})
+        self.assertEqual(refund.transaction, "tran_1")
+        client = paymill.Client({"id": "client_1", "payment": [{"id": "pay_1"}, "pay_2"]})
+        self.assertEqual([type(payment) for payment in client.payment], [paymill.Payment, str])
+
+    def test_to_dict_round_trip(self):
+        data = dict(self.data, unknown="kept")
+        transaction = paymill.Transaction(data)
+        self.assertEqual(transaction.extra, {"unknown": "kept"})
+        transaction.client
+        self.assertEqual(transaction.to_dict(), dict(data, amount=4200))
+        self.assertEqual(paymill.Transaction(transaction.to_dict()), transaction)
+
+    def test_timestamp_setter(self):
+        self.transaction.created_at = datetime.datetime(2014, 1, 1)
+        self.assertEqual(self.transaction.to_dict()["created_at"], 1388534400)
+        self.transaction.created_at = None
+        self.assertIsNone(self.transaction.created_at)
+
+
+class ModelClientTest(StubTestCase):
+
+    def test_responses_are_decoded_into_models(self):
+        client = paymill.Paymill("key", models=True)
+        self.assertIsInstance(client.clients.details("client_1")["data"], paymill.Client)
+        entities = client.transactions.list(filters=dict(count=3))["data"]
+        self.assertEqual([type(entity) for entity in entities], [paymill.Transaction] * 3)
+
+    def test_unknown_endpoint_keeps_dicts(self):
+        client = paymill.Paymill("key", models=True, transport=FakeTransport([(200, {"data": {"id": "hook_1"}})]))
+        self.assertEqual(client.get("webhooks", "hook_1")["data"], {"id": "hook_1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+import urlparse
+
+import paymill
+from tests.support import StubTestCase
+
+
+class PagingTransport(paymill.Transport):
+    """
+    transport answering list requests from a number of entities, without data_count
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.offsets = []
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        query = dict(urlparse.parse_qsl(urlparse.urlsplit(url).query))
+        offset, count = int(query["offset"]), int(query["count"])
+        self.offsets.append(offset)
+        data = [{"id": "client_%s" % index} for index in range(offset, min(offset + count, self.total))]
+        return paymill.Response(200, {}, json.dumps({"data": data}))
+
+
+class PagingTest(StubTestCase):
+
+    def setUp(self):
+        StubTestCase.setUp(self)
+        self.client = paymill.Paymill("key")
+
+    def test_iter_all_walks_every_page(self):
+        ids = [entity["id"] for entity in self.client.transactions.iter_all(count=20)]
+        self.assertEqual(len(ids), 50)
+        self.assertEqual(len(set(ids)), 50)
+        self.assertEqual(len(self.requests("GET")), 3)
+
+    def test_prefetched_pages_stop_at_data_count(self):
+        pages = list(self.client.transactions.iter_pages(count=20, workers=3, offset=5))
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(len(self.requests("GET")), 3)
+
+    def test_iter_all_with_prefetch(self):
+        self.assertEqual(len(list(self.client.clients.iter_all(count=20, prefetch=True))), 50)
+
+    def test_raw_pages_are_decoded(self):
+        client = paymill.Paymill("key", raw=True)
+        self.assertEqual(len(list(client.clients.iter_all(count=50))), 50)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, next, self.client.clients.iter_pages(count=0))
+        self.assertRaises(ValueError, next, self.client.clients.iter_pages(workers=-1))
+        self.assertRaises(ValueError, next, self.client.clients.iter_pages(filters="email"))
+
+
+class PagingWithoutCountTest(unittest.TestCase):
+
+    def test_short_page_ends_walk(self):
+        transport = PagingTransport(45)
+        client = paymill.Paymill("key", transport=transport)
+        self.assertEqual(len(list(client.clients.iter_all(count=10))), 45)
+        self.assertEqual(transport.offsets, [0, 10, 20, 30, 40])
+
+    def test_closed_walk_stops_fetching(self):
+        transport = PagingTransport(1000)
+        client = paymill.Paymill("key", transport=transport)
+        pages = client.clients.iter_pages(count=10, workers=2)
+        next(pages)
+        pages.close()
+        self.assertLessEqual(len(transport.offsets), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
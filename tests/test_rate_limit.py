@@ -0,0 +1,75 @@
+import time
+import unittest
+
+import paymill
+from tests.support import FakeTransport
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = paymill.TokenBucket(10, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+
+    def test_tokens_refill_up_to_burst(self):
+        bucket = paymill.TokenBucket(100, burst=2)
+        bucket.reserve(2)
+        time.sleep(0.1)
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0, 0])
+        self.assertGreater(bucket.reserve(), 0)
+
+    def test_throttle_halves_rate_and_pauses(self):
+        bucket = paymill.TokenBucket(10, burst=1)
+        bucket.throttle(pause=0.5)
+        self.assertEqual(bucket.rate, 5)
+        self.assertAlmostEqual(bucket.reserve(), 0.5, delta=0.05)
+
+        for _ in range(10):
+            bucket.throttle()
+        self.assertEqual(bucket.rate, 10 / 64.0)
+
+    def test_recover_steps_back_to_rate(self):
+        bucket = paymill.TokenBucket(16)
+        bucket.throttle()
+        bucket.recover()
+        self.assertEqual(bucket.rate, 9)
+        for _ in range(10):
+            bucket.recover()
+        self.assertEqual(bucket.rate, 16)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, paymill.TokenBucket, 0)
+        self.assertRaises(ValueError, paymill.TokenBucket, 1, burst=0)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_endpoint_and_global_limits(self):
+        limiter = paymill.RateLimiter(rate=100, burst=2, endpoints=dict(refunds=(10, 1)))
+        self.assertEqual(limiter.reserve("refunds"), 0)
+        self.assertAlmostEqual(limiter.reserve("refunds"), 0.1, delta=0.01)
+        self.assertGreater(limiter.reserve("clients"), 0)
+        self.assertEqual(paymill.RateLimiter().reserve("clients"), 0)
+
+    def test_feedback(self):
+        limiter = paymill.RateLimiter(rate=10, endpoints=dict(refunds=4))
+        limiter.feedback("refunds", paymill.Response(429, {"retry-after": "1"}, ""))
+        self.assertEqual((limiter.bucket.rate, limiter.buckets["refunds"].rate), (5, 2))
+        limiter.feedback("clients", paymill.Response(503, {}, ""))
+        self.assertEqual(limiter.bucket.rate, 5)
+        limiter.feedback("refunds", paymill.Response(200, {}, ""))
+        self.assertEqual(limiter.buckets["refunds"].rate, 2.25)
+
+    def test_client_waits_for_token(self):
+        transport = FakeTransport([(200, {"data": {}})])
+        client = paymill.Paymill("key", transport=transport, rate_limiter=paymill.RateLimiter(rate=20, burst=1))
+        started = time.time()
+        for _ in range(3):
+            client.get("clients", "client_1")
+        self.assertGreaterEqual(time.time() - started, 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import base64
+import unittest
+
+import paymill
+from tests.support import FakeTransport
+
+
+class RequestTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport([(200, {"data": {}})])
+        self.client = paymill.Paymill("key", transport=self.transport)
+
+    def test_authorization_header(self):
+        self.client.get("clients", "client_1")
+        self.assertEqual(self.transport.sent[0][2]["Authorization"], "Basic %s" % base64.b64encode("key:"))
+
+    def test_request_headers_do_not_leak_into_template(self):
+        self.client.post("clients", {"email": "a@b.c"})
+        self.client.get("clients", "client_1")
+        self.assertEqual(self.transport.sent[0][2]["Content-type"], "application/x-www-form-urlencoded")
+        self.assertNotIn("Content-type", self.transport.sent[1][2])
+
+    def test_urls(self):
+        self.assertEqual(self.client.client("clients", "client_1").url, "%sclients/client_1/" % self.client.API_URL)
+        # same url as built before templates, list urls keep their empty id
+        self.assertEqual(self.client.client("clients", params={"count": 1}).url,
+                         "%sclients//?count=1" % self.client.API_URL)
+        self.assertEqual(self.client._prefixes, {"clients": "%sclients/" % self.client.API_URL})
+
+    def test_method(self):
+        self.assertEqual(paymill.Request("url").get_method(), "GET")
+        self.assertEqual(paymill.Request("url", data="a=b").get_method(), "POST")
+        self.assertEqual(paymill.Request("url", data="a=b", method="PUT").get_method(), "PUT")
+
+    def test_instance_timeout(self):
+        client = paymill.Paymill("key", transport=self.transport, timeout=5)
+        self.assertEqual(client.client("clients").timeout, 5)
+        self.assertEqual(client.client("clients", timeout=1).timeout, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
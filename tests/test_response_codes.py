@@ -0,0 +1,42 @@
+import pickle
+import unittest
+
+import paymill
+
+
+class ApiResponseCodeTest(unittest.TestCase):
+
+    def test_known_codes_are_shared(self):
+        code = paymill.ApiResponseCode(20000)
+        self.assertIs(code, paymill.ApiResponseCode("20000"))
+        self.assertIs(code, paymill.API_RESPONSE_CODES[20000])
+        self.assertIs(pickle.loads(pickle.dumps(code)), code)
+
+    def test_classification(self):
+        success, timeout, card = [paymill.ApiResponseCode(code) for code in (20000, 50501, 40101)]
+        self.assertTrue(success.success)
+        self.assertFalse(success.retryable)
+        self.assertEqual(timeout.category, paymill.ApiResponseCode.TIMEOUT)
+        self.assertTrue(timeout.retryable)
+        self.assertEqual((card.category, card.message), (paymill.ApiResponseCode.CARD, "Problem with cvv."))
+        self.assertFalse(card.retryable)
+
+    def test_every_code_has_a_category(self):
+        codes = dict(paymill.ApiResponseCode.RESPONSE_CODES)
+        self.assertEqual(sorted(codes), sorted(paymill.ApiResponseCode.CATEGORIES))
+        self.assertEqual(len(paymill.API_RESPONSE_CODES), len(codes))
+
+    def test_unknown_code(self):
+        code = paymill.ApiResponseCode(99999)
+        self.assertEqual((code.code, code.category), (99999, paymill.ApiResponseCode.UNDEFINED))
+        self.assertNotIn(99999, paymill.API_RESPONSE_CODES)
+        self.assertEqual(code, paymill.ApiResponseCode(99999))
+
+    def test_codes_are_immutable(self):
+        code = paymill.ApiResponseCode(20000)
+        self.assertRaises(AttributeError, setattr, code, "message", "changed")
+        self.assertRaises(AttributeError, delattr, code, "category")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import time
+import unittest
+
+import paymill
+from tests.support import FakeTransport
+
+
+class RetryTest(unittest.TestCase):
+
+    def test_post_keeps_idempotency_key_across_retries(self):
+        transport = FakeTransport([(503, {"error": "unavailable"}), (503, {}), (200, {"data": {"id": "tran_1"}})])
+        client = paymill.Paymill("key", transport=transport, retry=paymill.RetryPolicy(backoff=0, jitter=False))
+
+        self.assertEqual(client.post("transactions", {"amount": 1})["data"]["id"], "tran_1")
+        self.assertEqual(len(transport.sent), 3)
+        keys = set(headers["Idempotency-Key"] for _, _, headers, _ in transport.sent)
+        self.assertEqual(len(keys), 1)
+        self.assertTrue(keys.pop())
+
+    def test_post_is_not_retried_without_idempotency_key(self):
+        transport = FakeTransport([(503, {"error": "unavailable"}), (200, {"data": {}})])
+        client = paymill.Paymill("key", transport=transport,
+                                 retry=paymill.RetryPolicy(backoff=0, jitter=False, idempotency_header=None))
+
+        self.assertRaises(paymill.ApiError, client.post, "transactions", {"amount": 1})
+        self.assertEqual(len(transport.sent), 1)
+        self.assertNotIn("Idempotency-Key", transport.sent[0][2])
+
+    def test_retry_after_beyond_max_backoff_is_not_waited_for(self):
+        policy = paymill.RetryPolicy(max_backoff=10, jitter=False)
+        self.assertEqual(policy.delay(1, time.time(), paymill.Response(503, {"Retry-After": "2"})), 2.0)
+        self.assertIsNone(policy.delay(1, time.time(), paymill.Response(503, {"Retry-After": "86400"})))
+
+    def test_gives_up_after_max_attempts(self):
+        transport = FakeTransport([(503, {"error": "unavailable"})])
+        client = paymill.Paymill("key", transport=transport,
+                                 retry=paymill.RetryPolicy(max_attempts=2, backoff=0, jitter=False))
+
+        self.assertRaises(paymill.ApiError, client.get, "clients", "client_1")
+        self.assertEqual(len(transport.sent), 2)
+
+    def test_get_has_no_idempotency_key(self):
+        transport = FakeTransport([(200, {"data": {}})])
+        client = paymill.Paymill("key", transport=transport, retry=paymill.RetryPolicy())
+        client.get("clients", "client_1")
+
+        self.assertNotIn("Idempotency-Key", transport.sent[0][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
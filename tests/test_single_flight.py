@@ -0,0 +1,95 @@
+import threading
+import unittest
+
+import paymill
+from tests.support import FakeTransport, StubTestCase
+
+
+class GatedTransport(FakeTransport):
+    """
+    fake transport holding the first GET request until released
+    """
+
+    def __init__(self, responses):
+        FakeTransport.__init__(self, responses)
+        self.waiting = threading.Event()
+        self.release = threading.Event()
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        if method == "GET" and not self.waiting.is_set():
+            self.waiting.set()
+            self.release.wait()
+        return FakeTransport.send(self, method, url, headers, body, timeout)
+
+
+class SingleFlightTest(StubTestCase):
+    latency = 0.2
+
+    def test_concurrent_identical_requests_are_sent_once(self):
+        client = paymill.Paymill("key")
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get("clients", "client_1"))) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(self.requests("GET")), 1)
+
+    def test_disabled_coalescing_sends_every_request(self):
+        client = paymill.Paymill("key", coalesce=False)
+        threads = [threading.Thread(target=client.get, args=("clients", "client_1")) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.requests("GET")), 3)
+
+
+class SingleFlightWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = GatedTransport([(200, {"data": {"id": "client_1", "email": "a@b.c"}})])
+        self.client = paymill.Paymill("key", transport=self.transport)
+        self.results = []
+        self.first = threading.Thread(target=lambda: self.results.append(self.get("clients", "client_1")))
+        self.first.start()
+        self.transport.waiting.wait()
+
+    def tearDown(self):
+        self.transport.release.set()
+        self.first.join()
+
+    def get(self, endpoint, id):
+        return self.client.get(endpoint, id)["data"]["email"]
+
+    def read(self):
+        """
+        reads client in another thread, returns None if the read joined the held flight
+        """
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.get("clients", "client_1")))
+        thread.daemon = True
+        thread.start()
+        thread.join(5)
+        return results[0] if results else None
+
+    def test_read_after_write_does_not_join_older_flight(self):
+        self.transport.responses = [(200, {"data": {"id": "client_1", "email": "new@b.c"}})]
+        self.client.put("clients", dict(email="new@b.c"), "client_1")
+        self.assertEqual(self.read(), "new@b.c")
+        self.assertEqual(len([sent for sent in self.transport.sent if sent[0] == "GET"]), 1)
+
+    def test_write_to_related_endpoint_splits_flight(self):
+        self.transport.responses = [(200, {"data": {"id": "sub_1", "client": "client_1"}}),
+                                    (200, {"data": {"id": "client_1", "email": "new@b.c"}})]
+        self.client.post("subscriptions", dict(client="client_1", offer="offer_1"))
+        self.assertEqual(self.read(), "new@b.c")
+
+
+if __name__ == "__main__":
+    unittest.main()
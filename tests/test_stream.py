@@ -0,0 +1,69 @@
+import json
+import random
+import unittest
+
+import paymill
+from tests.support import StubTestCase
+
+
+class StreamParserTest(unittest.TestCase):
+    body = (
+        '{"data_count": 4, "note": "data", "data" : [ {"a": "q\\\\\\"[{,", "b": [1, {"c": "]"}]}, '
+        '"s\\u00e9", 3 , {"id": "x"} ], "mode": "test"}'
+    )
+
+    def parse(self, sizes):
+        parser, items, pos = paymill.StreamParser(), [], 0
+        while pos < len(self.body):
+            size = next(sizes)
+            items += parser.feed(self.body[pos:pos + size])
+            pos += size
+        return parser, [json.loads(item) for item in items]
+
+    def test_items_split_across_chunks(self):
+        expected = json.loads(self.body)["data"]
+        for seed in range(200):
+            generator = random.Random(seed)
+            parser, items = self.parse(iter(lambda: generator.randint(1, 7), None))
+            self.assertEqual(items, expected)
+            self.assertTrue(parser.done)
+
+    def test_single_chunk(self):
+        self.assertEqual(self.parse(iter(lambda: len(self.body), None))[1], json.loads(self.body)["data"])
+
+    def test_empty_list(self):
+        parser = paymill.StreamParser()
+        self.assertEqual(parser.feed('{"data": []}'), [])
+        self.assertTrue(parser.done)
+
+
+class StreamTest(StubTestCase):
+
+    def test_entities_are_streamed(self):
+        client = paymill.Paymill("key", models=True)
+        transactions = list(paymill.Transactions(client).stream(filters=dict(count=20)))
+        self.assertEqual(len(transactions), 20)
+        self.assertEqual(transactions[0].amount, 4200)
+        self.assertEqual(len(client.transport.pool._idle), 1)
+
+    def test_raw_mode_yields_json(self):
+        client = paymill.Paymill("key", raw=True)
+        items = list(client.stream("clients", dict(count=2)))
+        self.assertEqual([json.loads(item)["email"] for item in items], ["lovely-client@example.com"] * 2)
+
+    def test_request_is_sent_before_iteration(self):
+        client = paymill.Paymill("key")
+        self.assertRaises(ValueError, client.stream, "transactions", params="bad")
+        self.assertRaises(ValueError, paymill.Transactions(client).stream, filters="bad")
+
+        items = client.stream("transactions", dict(count=3))
+        self.assertEqual(len(self.requests("GET")), 1)
+        self.assertEqual(len(list(items)), 3)
+
+    def test_error_status_raises_right_away(self):
+        client = paymill.Paymill("key")
+        self.assertRaises(paymill.ApiError, client.stream, "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
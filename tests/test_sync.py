@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import urlparse
+
+import paymill
+
+
+class SyncTransport(paymill.Transport):
+    """
+    transport answering list requests from rows, filtered by created_at, offset and count
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def send(self, method, url, headers=None, body=None, timeout=None):
+        query = dict(urlparse.parse_qsl(urlparse.urlsplit(url).query))
+        lower, upper = [int(value) for value in query["created_at"].split("-")]
+        rows = sorted([row for row in self.rows if lower <= row["created_at"] <= upper],
+                      key=lambda row: row["created_at"])
+        offset, count = int(query.get("offset", 0)), int(query.get("count", 20))
+        return paymill.Response(200, {}, json.dumps({"data": rows[offset:offset + count], "data_count": len(rows)}))
+
+
+class SyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [{"id": "tran_%03d" % index, "created_at": 1000 + index // 3} for index in range(30)]
+        self.client = paymill.Paymill("key", transport=SyncTransport(self.rows))
+
+    def test_fetches_only_new_entities(self):
+        sync = paymill.Sync(self.client, count=4)
+        self.assertEqual(len(list(sync.run("transactions", now=1005))), 18)
+
+        self.rows += [{"id": "tran_late", "created_at": 1005}, {"id": "tran_new", "created_at": 1007}]
+        ids = [entity["id"] for entity in sync.run("transactions", now=1007)]
+        self.assertEqual(ids, ["tran_late"] + ["tran_%03d" % index for index in range(18, 24)] + ["tran_new"])
+        self.assertEqual(list(sync.run("transactions", now=1007)), [])
+
+    def test_interrupted_run_resumes(self):
+        store = paymill.CheckpointStore()
+        run = paymill.Sync(self.client, store, count=4).run("transactions", now=2000)
+        first = [next(run)["id"] for _ in range(6)]
+        run.close()
+        self.assertEqual(store.get("transactions")["window"]["offset"], 4)
+
+        rest = [entity["id"] for entity in paymill.Sync(self.client, store, count=4).run("transactions", now=2000)]
+        self.assertEqual(first[:4] + rest, [row["id"] for row in self.rows])
+        self.assertNotIn("window", store.get("transactions"))
+        self.assertEqual(store.get("transactions")["mark"], 1009)
+
+
+    def test_file_store_keeps_checkpoints(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "checkpoints.json")
+        list(paymill.Sync(self.client, paymill.FileCheckpointStore(path), count=4).run("transactions", now=1005))
+
+        self.assertEqual(paymill.FileCheckpointStore(path).get("transactions")["mark"], 1005)
+        self.assertEqual(os.listdir(directory), ["checkpoints.json"])
+        sync = paymill.Sync(self.client, paymill.FileCheckpointStore(path), count=4)
+        self.assertEqual(list(sync.run("transactions", now=1005)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import paymill
+
+
+class TableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entities = [
+            {"id": "tran_1", "amount": 4200, "created_at": 86400, "currency": "EUR", "status": "closed",
+             "client": {"id": "client_1"}, "offer": None},
+            {"id": "tran_2", "amount": "1000", "created_at": 86400 * 2 + 1, "currency": "USD", "status": "failed",
+             "client": {"id": "client_2"}, "offer": "offer_1"},
+            {"id": "tran_3", "amount": 250.0, "created_at": 86400 * 2 + 2, "currency": "EUR", "status": "closed",
+             "client": {"id": "client_1"}, "offer": None},
+        ]
+        self.table = paymill.Table.from_entities(self.entities)
+
+    def test_numeric_values_are_coerced_to_integers(self):
+        self.assertEqual(list(self.table.columns["amount"]), [4200, 1000, 250])
+        table = paymill.Table.from_entities([{"id": "tran_4", "amount": "n/a", "created_at": None}])
+        self.assertEqual(list(table.columns["amount"]), [0])
+        self.assertEqual(list(table.columns["created_at"]), [0])
+
+    def test_columns_hold_int64_values(self):
+        table = paymill.Table.from_entities([{"id": "tran_4", "amount": 2 ** 40, "created_at": 2 ** 33}])
+        self.assertEqual(table.total(), 2 ** 40)
+        self.assertEqual(table.columns["created_at"][0], 2 ** 33)
+
+    def test_aggregates(self):
+        self.assertEqual(self.table.sum_by("currency"), {"EUR": 4450, "USD": 1000})
+        self.assertEqual(self.table.count_by("client"), {"client_1": 2, "client_2": 1})
+        self.assertEqual(self.table.aggregate("day"), {
+            datetime.date(1970, 1, 2): (1, 4200), datetime.date(1970, 1, 3): (2, 1250)
+        })
+        self.assertRaises(ValueError, self.table.aggregate, "week")
+
+    def test_where(self):
+        table = self.table.where(currency="EUR", since=datetime.datetime(1970, 1, 3))
+        self.assertEqual(table.ids, ["tran_3"])
+        self.assertEqual(self.table.where(currency="GBP").total(), 0)
+
+
+class Int64ListTest(unittest.TestCase):
+
+    def test_written_values_are_read_back_as_int64(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "column.bin")
+        values = [-1, 2 ** 40, 7]
+        with open(path, "wb") as fp:
+            paymill.Int64List(values).tofile(fp)
+
+        self.assertEqual(os.path.getsize(path), 24)
+        self.assertEqual(list(paymill.MappedColumn(path, paymill.TableWriter.DTYPE, 3)), values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import Queue
+import json
+import threading
+import time
+import unittest
+import urllib2
+
+import benchmark
+import paymill
+
+
+class WebhooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def handler(self, batch):
+        self.release.wait()
+        self.batches.append(batch)
+
+    def start(self, webhooks):
+        server = webhooks.server(port=0)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return "http://127.0.0.1:%s/" % server.server_port
+
+    def post(self, url, body):
+        try:
+            return urllib2.urlopen(url, body).getcode()
+        except urllib2.HTTPError, e:
+            return e.code
+
+    def event(self, event_type="transaction.succeeded"):
+        resource = benchmark.entity("transactions", "tran_1")
+        return json.dumps({"event": {"event_type": event_type, "event_resource": resource, "created_at": 1400000000}})
+
+    def test_events_are_accepted_and_handled(self):
+        webhooks = paymill.Webhooks(self.handler, batch_wait=0)
+        url = self.start(webhooks)
+
+        self.assertEqual(self.post(url, self.event()), 200)
+        webhooks.shutdown()
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(self.batches[0][0].event_type, "transaction.succeeded")
+        self.assertEqual(self.batches[0][0].resource.id, "tran_1")
+
+    def test_invalid_payload_is_refused(self):
+        webhooks = paymill.Webhooks(self.handler)
+        url = self.start(webhooks)
+
+        self.assertEqual(self.post(url, "junk"), 400)
+        self.assertEqual(self.post(url, json.dumps({"event": {"created_at": 1}})), 400)
+        self.assertEqual(webhooks.received, 0)
+
+    def test_full_queue_answers_503(self):
+        self.release.clear()
+        webhooks = paymill.Webhooks(self.handler, batch_size=1, batch_wait=0, queue_size=1)
+        url = self.start(webhooks)
+
+        self.assertEqual(self.post(url, self.event()), 200)
+        deadline = time.time() + 5
+        while webhooks._queue.qsize() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.post(url, self.event()), 200)
+        self.assertEqual(self.post(url, self.event()), 503)
+        self.assertRaises(Queue.Full, webhooks.put, [paymill.Event({"event_type": "x"})])
+        self.assertEqual(webhooks.refused, 2)
+
+        self.release.set()
+        webhooks.shutdown()
+        self.assertEqual(len(self.batches), 2)
+
+    def test_failed_batches_are_kept(self):
+        def handler(batch):
+            raise RuntimeError("handler failed")
+
+        webhooks = paymill.Webhooks(handler, batch_wait=0)
+        paymill.logger.disabled = True
+        self.addCleanup(setattr, paymill.logger, "disabled", False)
+        webhooks.put(webhooks.parse(self.event()))
+        webhooks.shutdown()
+
+        self.assertEqual(webhooks.failed, 1)
+        self.assertEqual([event.event_type for event in webhooks.failed_events()], ["transaction.succeeded"])
+        self.assertEqual(webhooks.failed_events(), [])
+
+    def test_events_are_batched(self):
+        webhooks = paymill.Webhooks(self.handler, batch_size=2, batch_wait=1, models=False)
+        for index in range(5):
+            webhooks.put(webhooks.parse(self.event("transaction.%s" % index)))
+        webhooks.shutdown()
+
+        self.assertEqual([len(batch) for batch in self.batches], [2, 2, 1])
+        self.assertEqual([event["event_type"] for batch in self.batches for event in batch],
+                         ["transaction.%s" % index for index in range(5)])
+
+    def test_on_error_gets_failed_batch(self):
+        failures = []
+
+        def handler(batch):
+            raise RuntimeError("handler failed")
+
+        webhooks = paymill.Webhooks(handler, batch_wait=0, on_error=lambda batch, exc_info: failures.append(
+            (batch, exc_info[0])
+        ))
+        paymill.logger.disabled = True
+        self.addCleanup(setattr, paymill.logger, "disabled", False)
+        webhooks.put(webhooks.parse(self.event()))
+        webhooks.shutdown()
+
+        self.assertEqual([(len(batch), exc_type) for batch, exc_type in failures], [(1, RuntimeError)])
+        self.assertEqual(webhooks.failed_events(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()